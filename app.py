@@ -3,76 +3,42 @@ import pandas as pd
 import plotly.express as px
 import numpy as np
 
+from common.data import (
+    MAX_CACHE_ENTRIES,
+    get_filtered,
+    get_key_index_points,
+    get_max_key_index,
+    load_filter_options,
+)
+
 # --- Configuration ---
 st.set_page_config(layout="wide", page_title="Dynamic Hash Table Analyzer")
 
-# Column Definitions for robust CSV loading
-ALL_COLS = [
-    'Key_Index', 'Load_Factor', 'Scale', 'Distribution',
-    'Chaining_Probes', 'Linear_Probing_Probes', 'Quadratic_Probing_Probes', 'Double_Hashing_Probes',
-    'Chaining_Time_ms', 'Linear_Probing_Time_ms', 'Quadratic_Probing_Time_ms', 'Double_Hashing_Time_ms'
-]
-
-PROBE_COLS = [
-    'Chaining_Probes', 'Linear_Probing_Probes', 'Quadratic_Probing_Probes', 'Double_Hashing_Probes'
-]
-
-TIME_COLS = [
-    'Chaining_Time_ms', 'Linear_Probing_Time_ms', 'Quadratic_Probing_Time_ms', 'Double_Hashing_Time_ms'
-]
-
-# Mapping technique names for display
-TECHNIQUE_MAP = {
-    'Chaining_Probes': 'Separate Chaining',
-    'Linear_Probing_Probes': 'Linear Probing',
-    'Quadratic_Probing_Probes': 'Quadratic Probing',
-    'Double_Hashing_Probes': 'Double Hashing',
-    'Chaining_Time_ms': 'Separate Chaining',
-    'Linear_Probing_Time_ms': 'Linear Probing',
-    'Quadratic_Probing_Time_ms': 'Quadratic Probing',
-    'Double_Hashing_Time_ms': 'Double Hashing',
-}
-
-@st.cache_data
-def load_data():
-    """Loads and reshapes the CSV data into a long format for plotting."""
-    try:
-        # Load data, skipping header and assigning column names explicitly
-        df = pd.read_csv(
-            'results_data.csv',
-            header=None,
-            names=ALL_COLS,
-            skiprows=1  # Skip the first row (the original header)
-        )
-    except Exception as e:
-        st.error(f"Error loading CSV data: {e}")
-        st.stop()
-
-    # --- Reshape Probe Data ---
-    df_probes = df.melt(
-        id_vars=['Scale', 'Distribution', 'Load_Factor', 'Key_Index'],
-        value_vars=PROBE_COLS,
-        var_name='Technique_Raw',
-        value_name='Metric_Value'
-    ).assign(Metric_Type='Total Probes')
-
-    # --- Reshape Timing Data ---
-    df_time = df.melt(
-        id_vars=['Scale', 'Distribution', 'Load_Factor', 'Key_Index'],
-        value_vars=TIME_COLS,
-        var_name='Technique_Raw',
-        value_name='Metric_Value'
-    ).assign(Metric_Type='Insertion Time (ms)')
-
-    # Combine data frames
-    df_long = pd.concat([df_probes, df_time], ignore_index=True)
+# Upper bound on points drawn per (Technique, Distribution) line
+MAX_POINTS_PER_TRACE = 2000
+
+def downsample_traces(df, max_points=MAX_POINTS_PER_TRACE):
+    """Thins each plotted series to at most max_points evenly spaced rows."""
+    groups = df.groupby(['Technique', 'Distribution'], observed=True).indices
+    if all(len(idx) <= max_points for idx in groups.values()):
+        return df
+
+    keep = np.concatenate([
+        idx if len(idx) <= max_points
+        else idx[np.linspace(0, len(idx) - 1, max_points).astype(int)]
+        for idx in groups.values()
+    ])
+    return df.iloc[np.sort(keep)]
+
+def shrink_for_transport(df):
+    """Narrows Load_Factor and Key_Index so st.dataframe ships a smaller Arrow payload."""
+    return df.assign(
+        Load_Factor=df['Load_Factor'].astype('float32'),
+        Key_Index=pd.to_numeric(df['Key_Index'], downcast='integer')
+    )
 
-    # Clean up technique names
-    df_long['Technique'] = df_long['Technique_Raw'].map(lambda x: TECHNIQUE_MAP[x])
-    
-    return df_long
 
-df = load_data()
+filter_options = load_filter_options()
 
 
 # --- Sidebar Filtering Options ---
@@ -97,7 +63,7 @@ selected_metric_type = st.sidebar.radio(
 )
 
 # Filter 2: Select Distribution
-available_distributions = df['Distribution'].unique()
+available_distributions = filter_options['distributions']
 selected_distributions = st.sidebar.multiselect(
     "3. Select Data Distribution(s)",
     available_distributions,
@@ -105,7 +71,7 @@ selected_distributions = st.sidebar.multiselect(
 )
 
 # Filter 3: Select Technique
-available_techniques = df['Technique'].unique()
+available_techniques = filter_options['techniques']
 selected_techniques = st.sidebar.multiselect(
     "4. Select Collision Technique(s)",
     available_techniques,
@@ -123,85 +89,119 @@ max_load_factor = st.sidebar.slider(
 )
 
 # --- Apply Filters ---
-df_filtered = df[
-    (df['Metric_Type'] == selected_metric_type) &
-    (df['Scale'] == scale_filter) &
-    (df['Distribution'].isin(selected_distributions)) &
-    (df['Technique'].isin(selected_techniques)) &
-    (df['Load_Factor'] <= max_load_factor)
-].copy()
-
-
-# --- Main App Title and Layout ---
-st.title(" Dynamic Hash Table Analyzer")
-st.markdown("Visualize collision resolution performance under varying load factors and data distributions.")
-
-st.subheader(f"{selected_metric_type} vs. Load Factor (α) - {scale_filter} Scale")
-st.write("The Y-axis shows the **cumulative total** cost of all insertions up to the given Load Factor.")
+# Sorted tuples give the cache a stable key regardless of selection order
+filter_key = (
+    scale_filter,
+    selected_metric_type,
+    tuple(sorted(selected_distributions)),
+    tuple(sorted(selected_techniques)),
+    max_load_factor
+)
 
-col1, col2 = st.columns([1, 4])
+# --- Plot Generation ---
+@st.cache_data(max_entries=MAX_CACHE_ENTRIES)
+def build_fig(scale, metric_type, distributions, techniques, max_lf):
+    """Builds the base performance chart; cached on the filter state so reruns reuse it."""
+    df_filtered = get_filtered(scale, metric_type, distributions, techniques, max_lf)
+    title = f"Collision Resolution Performance: {metric_type} vs. Load Factor"
+    y_label = metric_type
 
-with col1:
-    # Y-Axis Scale Selector
-    y_scale = st.radio(
-        "Y-Axis Scale",
-        ('Linear', 'Logarithmic'),
-        horizontal=True,
-        key='y_scale_selector'
-    )
-    y_axis_type = 'log' if y_scale == 'Logarithmic' and selected_metric_type == 'Total Probes' else 'linear'
-
-    # Single-Key Index Selector (for focused analysis)
-    max_key_index = int(df_filtered['Key_Index'].max())
-    if max_key_index > 1:
-        key_index = st.slider(
-            "Highlight Key Insertion Index",
-            min_value=1,
-            max_value=max_key_index,
-            value=max_key_index if max_key_index < 10 else 6,
-            step=1,
-            help="Focuses the chart on a specific insertion step for micro-analysis."
-        )
-    else:
-        key_index = 1
-
-with col2:
-    # --- Plot Generation ---
-    title = f"Collision Resolution Performance: {selected_metric_type} vs. Load Factor"
-    y_label = selected_metric_type
-    
     # Create the figure
     fig = px.line(
-        df_filtered,
+        downsample_traces(df_filtered),
         x='Load_Factor',
         y='Metric_Value',
         color='Technique',
         line_dash='Distribution',
         title=title,
         labels={'Metric_Value': y_label, 'Load_Factor': 'Load Factor (α)'},
-        height=600
+        height=600,
+        render_mode='webgl'  # Always use scattergl rather than SVG paths
     )
 
-    # Set Y-axis scale based on user selection
-    fig.update_yaxes(type=y_axis_type)
-
-    # Highlight a specific insertion point (Key_Index)
-    if key_index in df_filtered['Key_Index'].values:
-        df_key = df_filtered[df_filtered['Key_Index'] == key_index]
-        fig.add_scatter(
-            x=df_key['Load_Factor'],
-            y=df_key['Metric_Value'],
-            mode='markers',
-            marker=dict(size=12, symbol='star', line=dict(width=2, color='Red')),
-            name=f'Key Index {key_index}',
-            showlegend=False
+    # One shared tooltip per x position with a compact per-trace line
+    y_format = ',.0f' if metric_type == 'Total Probes' else '.6f'
+    fig.update_layout(hovermode='x unified')
+    fig.update_xaxes(hoverformat='.2f')
+    fig.update_traces(hovertemplate=f'%{{y:{y_format}}}')
+
+    return fig
+
+
+# --- Chart and Raw Data Fragments ---
+# Fragments rerun on their own when only their widgets change, skipping the
+# sidebar and filter lookups above.
+@st.fragment
+def render_plot(filter_key):
+    """Draws the chart with its y-axis and key-index controls."""
+    metric_type = filter_key[1]
+    col1, col2 = st.columns([1, 4])
+
+    with col1:
+        # Y-Axis Scale Selector
+        y_scale = st.radio(
+            "Y-Axis Scale",
+            ('Linear', 'Logarithmic'),
+            horizontal=True,
+            key='y_scale_selector'
         )
+        y_axis_type = 'log' if y_scale == 'Logarithmic' and metric_type == 'Total Probes' else 'linear'
+
+        # Single-Key Index Selector (for focused analysis)
+        max_key_index = get_max_key_index(*filter_key)
+        if max_key_index > 1:
+            key_index = st.slider(
+                "Highlight Key Insertion Index",
+                min_value=1,
+                max_value=max_key_index,
+                value=max_key_index if max_key_index < 10 else 6,
+                step=1,
+                help="Focuses the chart on a specific insertion step for micro-analysis."
+            )
+        else:
+            key_index = 1
+
+    with col2:
+        # The cached base figure comes back as a fresh copy, so the per-widget
+        # touches below never rebuild or mutate the cached entry
+        fig = build_fig(*filter_key)
+
+        # Set Y-axis scale based on user selection
+        fig.update_yaxes(type=y_axis_type)
+
+        # Highlight a specific insertion point (Key_Index)
+        key_points = get_key_index_points(*filter_key).get(key_index)
+        if key_points is not None:
+            key_x, key_y = key_points
+            fig.add_scattergl(
+                x=key_x,
+                y=key_y,
+                mode='markers',
+                marker=dict(size=12, symbol='star', line=dict(width=2, color='Red')),
+                name=f'Key Index {key_index}',
+                showlegend=False
+            )
+
+        st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def render_raw_data(filter_key):
+    """Shows the filtered rows behind the chart on request."""
+    if st.checkbox("Show Raw Data Table", value=False):
+        st.subheader(f"Raw Simulation Data ({filter_key[0]} Scale)")
+        st.dataframe(shrink_for_transport(get_filtered(*filter_key)))
+
+
+# --- Main App Title and Layout ---
+st.title(" Dynamic Hash Table Analyzer")
+st.markdown("Visualize collision resolution performance under varying load factors and data distributions.")
+
+st.subheader(f"{selected_metric_type} vs. Load Factor (α) - {scale_filter} Scale")
+st.write("The Y-axis shows the **cumulative total** cost of all insertions up to the given Load Factor.")
 
-    st.plotly_chart(fig, use_container_width=True)
+render_plot(filter_key)
 
 # --- Raw Data Section ---
-if st.checkbox("Show Raw Data Table", value=False):
-    st.subheader(f"Raw Simulation Data ({scale_filter} Scale)")
-    st.dataframe(df_filtered)
+render_raw_data(filter_key)
 
 st.caption("Developed using C for simulation and Python/Streamlit for visualization.")
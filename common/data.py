@@ -0,0 +1,179 @@
+"""Cached data loading and filtering shared by the Streamlit pages."""
+import os
+import tempfile
+
+import streamlit as st
+import pandas as pd
+import numpy as np
+
+# Column Definitions for robust CSV loading
+ALL_COLS = [
+    'Key_Index', 'Load_Factor', 'Scale', 'Distribution',
+    'Chaining_Probes', 'Linear_Probing_Probes', 'Quadratic_Probing_Probes', 'Double_Hashing_Probes',
+    'Chaining_Time_ms', 'Linear_Probing_Time_ms', 'Quadratic_Probing_Time_ms', 'Double_Hashing_Time_ms'
+]
+
+PROBE_COLS = [
+    'Chaining_Probes', 'Linear_Probing_Probes', 'Quadratic_Probing_Probes', 'Double_Hashing_Probes'
+]
+
+TIME_COLS = [
+    'Chaining_Time_ms', 'Linear_Probing_Time_ms', 'Quadratic_Probing_Time_ms', 'Double_Hashing_Time_ms'
+]
+
+# Explicit dtypes skip type inference and keep the parsed frame compact.
+# Load_Factor stays float64 so the slider bounds compare exactly.
+CSV_DTYPES = {
+    'Key_Index': 'int32',
+    'Load_Factor': 'float64',
+    'Scale': 'category',
+    'Distribution': 'category',
+    **{col: 'float32' for col in PROBE_COLS + TIME_COLS},
+}
+
+# Mapping technique names for display
+TECHNIQUE_MAP = {
+    'Chaining_Probes': 'Separate Chaining',
+    'Linear_Probing_Probes': 'Linear Probing',
+    'Quadratic_Probing_Probes': 'Quadratic Probing',
+    'Double_Hashing_Probes': 'Double Hashing',
+    'Chaining_Time_ms': 'Separate Chaining',
+    'Linear_Probing_Time_ms': 'Linear Probing',
+    'Quadratic_Probing_Time_ms': 'Quadratic Probing',
+    'Double_Hashing_Time_ms': 'Double Hashing',
+}
+
+DATA_PATH = 'results_data.csv'
+
+# Bound on entries kept by caches keyed on filter state
+MAX_CACHE_ENTRIES = 64
+
+# Reshaped frame persisted across process restarts; rebuilt whenever the CSV
+# or this module is newer than it
+LONG_CACHE_PATH = 'results_data.long.parquet'
+
+def long_cache_is_fresh():
+    """Checks whether the Parquet sidecar is newer than its inputs."""
+    if not os.path.exists(LONG_CACHE_PATH):
+        return False
+    cache_mtime = os.path.getmtime(LONG_CACHE_PATH)
+    return all(
+        os.path.exists(path) and cache_mtime >= os.path.getmtime(path)
+        for path in (DATA_PATH, __file__)
+    )
+
+def write_long_cache(df_long):
+    """Writes the Parquet sidecar via a temp file so it only appears complete."""
+    cache_dir = os.path.dirname(os.path.abspath(LONG_CACHE_PATH))
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.parquet.tmp')
+    except OSError:
+        return  # Read-only checkout; keep serving from the in-process cache
+
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            df_long.to_parquet(f, index=False)
+        os.replace(tmp_path, LONG_CACHE_PATH)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+@st.cache_data
+def load_data():
+    """Loads and reshapes the CSV data into a long format for plotting."""
+    if long_cache_is_fresh():
+        try:
+            return pd.read_parquet(LONG_CACHE_PATH)
+        except Exception:
+            pass  # Damaged sidecar; rebuild it from the CSV below
+
+    try:
+        # Load data, skipping header and assigning column names explicitly
+        df = pd.read_csv(
+            DATA_PATH,
+            header=None,
+            names=ALL_COLS,
+            skiprows=1,  # Skip the first row (the original header)
+            dtype=CSV_DTYPES
+        )
+    except Exception as e:
+        st.error(f"Error loading CSV data: {e}")
+        st.stop()
+
+    # --- Reshape to long format ---
+    # Stack the metric columns column-major so each technique's rows stay
+    # contiguous, matching the row order of a melt per metric group.
+    n = len(df)
+    value_cols = PROBE_COLS + TIME_COLS
+    k = len(value_cols)
+    df_long = pd.DataFrame({
+        # Tile the category codes so no per-row label objects are created
+        **{
+            col: pd.Categorical.from_codes(
+                np.tile(df[col].cat.codes.to_numpy(), k), df[col].cat.categories
+            )
+            for col in ('Scale', 'Distribution')
+        },
+        **{col: np.tile(df[col].to_numpy(), k) for col in ('Load_Factor', 'Key_Index')},
+        'Technique_Raw': np.repeat(value_cols, n),
+        'Metric_Value': df[value_cols].to_numpy().reshape(-1, order='F'),
+        'Metric_Type': np.repeat(
+            ['Total Probes'] * len(PROBE_COLS) + ['Insertion Time (ms)'] * len(TIME_COLS), n
+        ),
+    }, copy=False)  # The arrays above are freshly built, so skip the defensive copy
+
+    # Clean up technique names
+    df_long['Technique'] = df_long['Technique_Raw'].map(TECHNIQUE_MAP)
+    del df_long['Technique_Raw']
+
+    # Low-cardinality labels as categoricals so filters compare integer codes
+    for col in ('Technique', 'Metric_Type'):
+        df_long[col] = df_long[col].astype('category')
+
+    write_long_cache(df_long)
+
+    return df_long
+
+@st.cache_data
+def load_filter_options():
+    """Returns the sidebar choices, computed once per data load."""
+    df = load_data()
+    return {
+        'distributions': tuple(df['Distribution'].unique()),
+        'techniques': tuple(df['Technique'].unique()),
+    }
+
+@st.cache_data(max_entries=MAX_CACHE_ENTRIES)
+def get_filtered(scale, metric_type, distributions, techniques, max_lf):
+    """Returns the long-form slice matching the sidebar selections."""
+    df = load_data()
+    # Combine the masks as plain NumPy arrays to skip index alignment; no
+    # .copy() is needed since st.cache_data hands each caller its own copy.
+    mask = (
+        (df['Metric_Type'] == metric_type).to_numpy() &
+        (df['Scale'] == scale).to_numpy() &
+        df['Distribution'].isin(distributions).to_numpy() &
+        df['Technique'].isin(techniques).to_numpy() &
+        (df['Load_Factor'].to_numpy() <= max_lf)
+    )
+    return df[mask]
+
+@st.cache_data
+def get_max_key_index(scale, metric_type, distributions, techniques, max_lf):
+    """Returns the largest Key_Index in the filtered slice."""
+    df_filtered = get_filtered(scale, metric_type, distributions, techniques, max_lf)
+    return int(df_filtered['Key_Index'].max())
+
+@st.cache_resource(max_entries=MAX_CACHE_ENTRIES)
+def get_key_index_points(scale, metric_type, distributions, techniques, max_lf):
+    """Maps each Key_Index to its (Load_Factor, Metric_Value) arrays in the filtered slice.
+
+    Held as a shared resource (no per-call copy) since callers only read it.
+    """
+    df_filtered = get_filtered(scale, metric_type, distributions, techniques, max_lf)
+    x = df_filtered['Load_Factor'].to_numpy()
+    y = df_filtered['Metric_Value'].to_numpy()
+    return {
+        key: (x[rows], y[rows])
+        for key, rows in df_filtered.groupby('Key_Index').indices.items()
+    }